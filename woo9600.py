@@ -1,9 +1,23 @@
+import numpy as np
 from woocommerce import API
+from woocommerce.oauth import OAuth
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    from json import loads as json_loads
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
+from time import time
 import json
-from typing import List, Dict, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 import statistics
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 def print_retro_header():
     """Print a cool retro-style header."""
@@ -15,9 +29,98 @@ def print_retro_header():
 """
     return header
 
+def _wma_convolve(data: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    window = kernel.shape[0]
+    result = np.full(data.shape[0], np.nan)
+    result[window - 1:] = np.convolve(data, kernel, mode='valid')
+    return result
+
+def _wma_loop(data: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    window = kernel.shape[0]
+    result = np.full(data.shape[0], np.nan)
+    for i in range(window - 1, data.shape[0]):
+        total = 0.0
+        for j in range(window):
+            total += data[i - j] * kernel[j]
+        result[i] = total
+    return result
+
+@lru_cache(maxsize=1)
+def _wma_core() -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """Return the weighted moving average kernel, compiling it with numba on first use.
+
+    The kernel takes the data and the reversed weights and returns an array
+    with NaN in the warm-up region. numba is optional and imported here rather
+    than at module load so callers that never need a moving average don't pay
+    for it; without numba the np.convolve version is used.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _wma_convolve
+    return njit(cache=True, fastmath=True)(_wma_loop)
+
+class PooledAPI(API):
+    """WooCommerce API client that sends GETs over one keep-alive session."""
+
+    def __init__(self, url: str, consumer_key: str, consumer_secret: str, **kwargs):
+        super().__init__(url, consumer_key, consumer_secret, **kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session = Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "user-agent": self.user_agent,
+            "accept": "application/json"
+        })
+
+    def _endpoint_url(self, endpoint: str) -> str:
+        url = self.url if self.url.endswith("/") else f"{self.url}/"
+        api = "wp-json" if self.wp_api else "wc-api"
+        return f"{url}{api}/{self.version}/{endpoint}"
+
+    def get(self, endpoint: str, params: Dict = None, **kwargs):
+        # Same auth selection as woocommerce.API; oauth_timestamp is only for signing
+        url = self._endpoint_url(endpoint)
+        params = dict(params or {})
+        oauth_timestamp = kwargs.pop("oauth_timestamp", None)
+        auth = None
+
+        if self.is_ssl and not self.query_string_auth:
+            auth = HTTPBasicAuth(self.consumer_key, self.consumer_secret)
+        elif self.is_ssl:
+            params.update({
+                "consumer_key": self.consumer_key,
+                "consumer_secret": self.consumer_secret
+            })
+        else:
+            # Plain HTTP needs OAuth1.0a; the signed URL already carries the params
+            url = OAuth(
+                url=f"{url}?{urlencode(params)}",
+                consumer_key=self.consumer_key,
+                consumer_secret=self.consumer_secret,
+                version=self.version,
+                method="GET",
+                oauth_timestamp=oauth_timestamp or int(time())
+            ).get_oauth_url()
+            params = None
+
+        return self.session.get(
+            url,
+            auth=auth,
+            params=params,
+            verify=self.verify_ssl,
+            timeout=self.timeout,
+            **kwargs
+        )
+
 class WooCommerceAnalytics:
     def __init__(self, url: str, consumer_key: str, consumer_secret: str):
-        self.wcapi = API(
+        self.wcapi = PooledAPI(
             url=url,
             consumer_key=consumer_key,
             consumer_secret=consumer_secret,
@@ -25,134 +128,106 @@ class WooCommerceAnalytics:
             timeout=60
         )
 
-    def get_sales_data(self, days: int = 30) -> List[Dict]:
+    def get_sales_data(self, days: int = 30, project: Callable[[Dict], Any] = None) -> List[Any]:
+        if project is None:
+            # date_created is "YYYY-MM-DDTHH:MM:SS"; the first 10 chars are the date
+            project = lambda order: order['date_created'][:10]
+
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
-        all_orders = []
-        page = 1
-
-        while True:
-            orders = self.wcapi.get("orders", params={
-                'after': start_date.isoformat(),
-                'before': end_date.isoformat(),
-                'per_page': 100,
-                'page': page,
-                'status': 'completed'
-            }).json()
-
-            if not orders:
-                break
-
-            all_orders.extend(orders)
-            page += 1
-
-        return all_orders
-
-    def aggregate_daily_sales(self, orders: List[Dict]) -> Dict[str, int]:
-        daily_sales = defaultdict(int)
-        for order in orders:
-            date = datetime.fromisoformat(order['date_created']).strftime('%Y-%m-%d')
-            daily_sales[date] += 1
-        return dict(sorted(daily_sales.items()))
-
-    def calculate_moving_average(self, data: List[int], window: int, weights: List[float] = None) -> List[float]:
-        if weights is None:
-            weights = [1/window] * window
-
+        params = {
+            'after': start_date.isoformat(),
+            'before': end_date.isoformat(),
+            'per_page': 100,
+            'status': 'completed'
+        }
+
+        def fetch_page(page: int):
+            # Pages are fetched concurrently, so each call gets its own copy of params
+            response = self.wcapi.get("orders", params={**params, 'page': page})
+            response.raise_for_status()
+            orders = json_loads(response.content)
+            if not isinstance(orders, list):
+                raise ValueError(f"Unexpected orders response on page {page}")
+            # Keep only the projected fields so each page's full order dicts can be freed
+            return response.headers, [project(order) for order in orders]
+
+        headers, sales = fetch_page(1)
+        all_sales = sales
+        total_pages = headers.get('X-WP-TotalPages')
+
+        if total_pages is None:
+            # Without a page count, keep fetching until an empty page like the API expects
+            page = 1
+            while sales:
+                page += 1
+                _, sales = fetch_page(page)
+                all_sales.extend(sales)
+        else:
+            # The first page told us how many pages there are; fetch the rest in parallel
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for _, sales in executor.map(fetch_page, range(2, int(total_pages) + 1)):
+                    all_sales.extend(sales)
+
+        return all_sales
+
+    def aggregate_daily_sales(self, dates: Iterable[str]) -> Dict[str, int]:
+        return dict(sorted(Counter(dates).items()))
+
+    def _check_weights(self, weights: List[float], window: int):
         if len(weights) != window:
             raise ValueError("Length of weights must equal window size")
 
         if abs(sum(weights) - 1) > 1e-10:
             raise ValueError("Weights must sum to 1")
 
-        result = []
-        for i in range(len(data)):
-            if i < window - 1:
-                result.append(None)
-                continue
-
-            weighted_sum = sum(w * v for w, v in zip(weights, data[i-window+1:i+1]))
-            result.append(round(weighted_sum, 2))
-
-        return result
-
-class RetroASCIIGraph:
-    def __init__(self):
-        self.height = 20
-        self.max_y = 20
-        self.min_y = 0
-        self.left_margin = 6  # Space for y-axis labels
-        self.label_spacing = 3  # Each label + 2 dots spacing
-
-    def normalize_data(self, data: List[float]) -> List[float]:
-        return [
-            None if x is None else
-            self.height - 1 - int((min(x, self.max_y) / self.max_y) * (self.height - 1))
-            for x in data
-        ]
-
-    def draw(self, data_series: List[Tuple[List[float], str, str]], days_ago: List[int]) -> str:
-        # Calculate width based on number of x-axis labels and spacing
-        self.width = len(days_ago) * self.label_spacing - 1
-        self.total_width = self.width + self.left_margin + 2  # +2 for borders
+    def calculate_moving_average(self, data: List[int], window: int, weights: List[float] = None) -> List[float]:
+        if weights is None:
+            weights = [1/window] * window
 
-        normalized_series = [
-            (self.normalize_data(data), label, symbol)
-            for data, label, symbol in data_series
-        ]
+        self._check_weights(weights, window)
 
-        # Initialize graph with dots
-        graph = [['·' for _ in range(self.width)] for _ in range(self.height)]
+        if len(data) < window:
+            return [None] * len(data)
 
-        # Plot data points
-        x_scale = (self.width - 1) / (len(days_ago) - 1)
-        for normalized_data, _, symbol in normalized_series:
-            for i, y in enumerate(normalized_data):
-                if y is not None:
-                    x = int(i * x_scale)
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        graph[y][x] = symbol
+        # Convolution order: reverse the weights so weights[-1] lands on the newest point
+        values = np.asarray(data, dtype=np.float64)
+        kernel = np.asarray(weights[::-1], dtype=np.float64)
+        weighted = _wma_core()(values, kernel)
 
-        output = []
+        return [None] * (window - 1) + np.round(weighted[window - 1:], 2).tolist()
 
-        # Add legend
-        output.append('╔════ DATA SERIES ═════════════════════╗')
-        for _, label, symbol in data_series:
-            output.append(f'║ {symbol} : {label:<32} ║')
-        output.append('╚══════════════════════════════════════╝')
-        output.append('')
+    def calculate_moving_averages(self, data: List[int], window: int, weight_sets: List[List[float]]) -> List[List[float]]:
+        for weights in weight_sets:
+            self._check_weights(weights, window)
 
-        # Add top border
-        output.append('╔' + '═' * self.total_width + '╗')
+        if not weight_sets:
+            return []
 
-        # Add graph with y-axis labels
-        for i in range(self.height):
-            y_value = self.max_y - i
-            row = f'║ {y_value:2d} │ {"".join(graph[i])} ║'
-            output.append(row)
-
-        # Add x-axis separator
-        output.append('╟' + '─' * self.left_margin + '┴' + '─' * self.width + '╢')
+        if len(data) < window:
+            return [[None] * len(data) for _ in weight_sets]
 
-        # Create x-axis with evenly spaced labels
-        x_axis = [' ' for _ in range(self.width)]
-        for i, day in enumerate(days_ago):
-            pos = i * self.label_spacing
-            label = str(day)
-            for j, char in enumerate(label):
-                if pos + j < self.width:
-                    x_axis[pos + j] = char
+        # One pass over the data for every weight set: (N-window+1, window) @ (window, k)
+        windows = np.lib.stride_tricks.sliding_window_view(np.asarray(data, dtype=np.float64), window)
+        weighted = np.round(windows @ np.asarray(weight_sets, dtype=np.float64).T, 2)
 
-        # Add x-axis to output
-        output.append(f'║ {" " * self.left_margin}{"".join(x_axis)} ║')
-        output.append(f'║ {" " * self.left_margin}{"Days Ago":^{self.width}} ║')
-
-        # Add bottom border
-        output.append('╚' + '═' * self.total_width + '╝')
+        return [[None] * (window - 1) + column.tolist() for column in weighted.T]
 
-        return '\n'.join(output)
+@lru_cache(maxsize=4)
+def _build_x_axis(days_ago: Tuple[int, ...], width: int) -> str:
+    """Lay out the x-axis labels for a graph area of the given width."""
+    x_scale = (width - 1) / (len(days_ago) - 1)
+    x_axis = bytearray(b' ' * width)
+    for i, day in enumerate(days_ago):
+        label = str(day).encode('ascii')
+        # Center the label around its position
+        start = max(0, int(i * x_scale) - len(label)//2)
+        end = min(start + len(label), width)
+        x_axis[start:end] = label[:end - start]
+    return x_axis.decode('ascii')
 
+class RetroASCIIGraph:
     def __init__(self):
         self.width = 100  # Graph area width
         self.height = 20
@@ -160,31 +235,41 @@ class RetroASCIIGraph:
         self.min_y = 0
         self.left_margin = 6  # Space for y-axis labels
         self.total_width = self.width + self.left_margin + 1
-
-    def normalize_data(self, data: List[float]) -> List[float]:
-        return [
-            None if x is None else
-            self.height - 1 - int((min(x, self.max_y) / self.max_y) * (self.height - 1))
-            for x in data
-        ]
+        # Fixed after construction, so normalize_data doesn't recompute them per call
+        self._y_top = self.height - 1
+        self._y_scale = self._y_top / self.max_y
+        # Decorations depend only on the dimensions above, so build them once
+        self._top_border = '╔' + '═' * self.total_width + '╗'
+        self._bottom_border = '╚' + '═' * self.total_width + '╝'
+        self._separator = '╟' + '─' * self.left_margin + '┴' + '─' * self.width + '╢'
+        self._y_labels = [f'║ {self.max_y - i:2d} │ ' for i in range(self.height)]
+        self._days_ago_title = f'║ {" " * self.left_margin}{"Days Ago":^{self.width}}║'
+
+    def normalize_data(self, data: List[float]) -> np.ndarray:
+        # None becomes NaN, so missing points stay NaN through the arithmetic
+        values = np.asarray(data, dtype=np.float64)
+        return self._y_top - np.trunc(np.minimum(values, self.max_y) * self._y_scale)
 
     def draw(self, data_series: List[Tuple[List[float], str, str]], days_ago: List[int]) -> str:
-        normalized_series = [
-            (self.normalize_data(data), label, symbol)
-            for data, label, symbol in data_series
-        ]
+        # Flatten every series into one set of (y, x, symbol) points, in series order
+        normalized = [self.normalize_data(data) for data, _, _ in data_series]
+        lengths = [len(ys) for ys in normalized]
+        ys = np.concatenate([np.empty(0)] + normalized)
+        x_scale = (self.width - 1) / (len(days_ago) - 1)
+        xs = (np.concatenate([np.arange(n) for n in [0] + lengths]) * x_scale).astype(np.int32)
+        symbols = np.repeat(np.array([symbol for _, _, symbol in data_series], dtype='<U1'), lengths)
 
-        # Initialize graph with dots
-        graph = [['·' for _ in range(self.width)] for _ in range(self.height)]
+        # Bounds-check on the float rows before casting; NaN compares False so missing points drop too
+        in_bounds = (ys >= 0) & (ys < self.height) & (xs < self.width)
+        ys = ys[in_bounds].astype(np.int32)
+        xs = xs[in_bounds]
+        symbols = symbols[in_bounds]
 
-        # Plot data points
-        x_scale = (self.width - 1) / (len(days_ago) - 1)
-        for normalized_data, _, symbol in normalized_series:
-            for i, y in enumerate(normalized_data):
-                if y is not None:
-                    x = int(i * x_scale)
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        graph[y][x] = symbol
+        # Initialize graph with dots, then plot every point in one scatter;
+        # later series overwrite earlier ones since assignment runs in order
+        graph = np.full((self.height, self.width), '·', dtype='<U1')
+        flat = graph.reshape(-1)
+        flat[np.ravel_multi_index((ys, xs), graph.shape)] = symbols
 
         output = []
 
@@ -196,40 +281,23 @@ class RetroASCIIGraph:
         output.append('')
 
         # Add top border
-        output.append('╔' + '═' * self.total_width + '╗')
+        output.append(self._top_border)
 
         # Add graph with y-axis labels
-        for i in range(self.height):
-            y_value = self.max_y - i
-            row = f'║ {y_value:2d} │ {"".join(graph[i])} ║'
-            output.append(row)
+        # Reinterpret each row of '<U1' cells as one '<U{width}' string, no per-char join
+        rows = graph.view(f'<U{self.width}').ravel().tolist()
+        for y_label, row in zip(self._y_labels, rows):
+            output.append(f'{y_label}{row} ║')
 
         # Add x-axis separator
-        output.append('╟' + '─' * self.left_margin + '┴' + '─' * self.width + '╢')
-
-        # Calculate x-axis label positions
-        x_labels = []
-        label_positions = []
-        for i, day in enumerate(days_ago):
-            pos = int(i * x_scale)
-            label_positions.append(pos)
-            x_labels.append(str(day))
-
-        # Create x-axis with aligned labels
-        x_axis = [' ' for _ in range(self.width)]
-        for pos, label in zip(label_positions, x_labels):
-            # Center the label around its position
-            start = max(0, pos - len(label)//2)
-            for j, char in enumerate(label):
-                if start + j < self.width:
-                    x_axis[start + j] = char
+        output.append(self._separator)
 
         # Add x-axis to output
-        output.append(f'║ {" " * self.left_margin}{"".join(x_axis)}║')
-        output.append(f'║ {" " * self.left_margin}{"Days Ago":^{self.width}}║')
+        output.append(f'║ {" " * self.left_margin}{_build_x_axis(tuple(days_ago), self.width)}║')
+        output.append(self._days_ago_title)
 
         # Add bottom border
-        output.append('╚' + '═' * self.total_width + '╝')
+        output.append(self._bottom_border)
 
         return '\n'.join(output)
 
@@ -249,19 +317,17 @@ def main():
     try:
         print("⚡ Fetching sales data...")
         days_to_fetch = 30
-        orders = wc.get_sales_data(days=days_to_fetch)
-        daily_sales = wc.aggregate_daily_sales(orders)
+        dates = wc.get_sales_data(days=days_to_fetch)
+        daily_sales = wc.aggregate_daily_sales(dates)
 
         print("📊 Processing statistics...")
         sales = list(daily_sales.values())
         days_ago = list(range(days_to_fetch-1, -1, -1))
 
-        ma7 = wc.calculate_moving_average(sales, 7)
-        ma7_weighted = wc.calculate_moving_average(
-            sales,
-            7,
+        ma7, ma7_weighted = wc.calculate_moving_averages(sales, 7, [
+            [1/7] * 7,
             [0.05, 0.1, 0.1, 0.15, 0.15, 0.2, 0.25]
-        )
+        ])
 
         graph = RetroASCIIGraph()
         visualization = graph.draw([